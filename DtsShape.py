@@ -147,9 +147,31 @@ class DtsInputStream(object):
 		self.tell8 += 1
 		return data
 
+	def read32_array(self, count):
+		if self.tell32 + count > len(self.buffer32):
+			raise EOFError()
+
+		data = self.buffer32[self.tell32:self.tell32 + count]
+		self.tell32 += count
+		return data
+
+	def read16_array(self, count):
+		if self.tell16 + count > len(self.buffer16):
+			raise EOFError()
+
+		data = self.buffer16[self.tell16:self.tell16 + count]
+		self.tell16 += count
+		return data
+
+	def read_u16_array(self, count):
+		return array("H", self.read16_array(count).tobytes())
+
 	def read_float(self):
 		return unpack("f", pack("i", self.read32()))[0]
 
+	def read_float_array(self, count):
+		return array("f", self.read32_array(count).tobytes())
+
 	def read_string(self):
 		buf = bytearray()
 		while True:
@@ -1,6 +1,7 @@
 # vim: tabstop=8 noexpandtab
 
 from collections import namedtuple
+from array import array
 from struct import pack, unpack
 from enum import Enum
 
@@ -10,6 +11,42 @@ from mathutils import Euler, Matrix, Quaternion, Vector
 def bit(n):
         return 1 << n
 
+def vector_properties(name, size):
+        # A list of Vectors and the same data as a flat float array. Whichever one
+        # was assigned last is kept and the other is derived from it on demand. A
+        # list derived from a flat array is cached alongside it, so assign a new
+        # list rather than modifying it in place
+        list_attr = "_" + name
+        flat_attr = "_" + name + "_flat"
+
+        def get_list(self):
+                vectors = getattr(self, list_attr)
+
+                if vectors is None:
+                        flat = getattr(self, flat_attr)
+                        vectors = [Vector(flat[i:i + size]) for i in range(0, len(flat), size)]
+                        setattr(self, list_attr, vectors)
+
+                return vectors
+
+        def set_list(self, vectors):
+                setattr(self, list_attr, vectors)
+                setattr(self, flat_attr, None)
+
+        def get_flat(self):
+                flat = getattr(self, flat_attr)
+
+                if flat is None:
+                        flat = array("f", (c for vector in getattr(self, list_attr) for c in vector))
+
+                return flat
+
+        def set_flat(self, flat):
+                setattr(self, list_attr, None)
+                setattr(self, flat_attr, flat)
+
+        return property(get_list, set_list), property(get_flat, set_flat)
+
 class Box:
         def __init__(self, min, max):
                 self.min = min
@@ -184,6 +221,10 @@ class Mesh:
 
         TypeName = ["Standard", "Skin", "Decal", "Sorted", "Null"]
 
+        verts, verts_flat = vector_properties("verts", 3)
+        tverts, tverts_flat = vector_properties("tverts", 2)
+        normals, normals_flat = vector_properties("normals", 3)
+
         Billboard = bit(31)
         HasDetailTexture = bit(30)
         BillboardZAxis = bit(29)
@@ -335,17 +376,18 @@ class Mesh:
                 self.radius = stream.read_float()
 
                 # Geometry data
+                # Kept as flat float arrays; Vector lists are only built if asked for
                 n_vert = stream.read32()
-                self.verts = [stream.read_vec3() for i in range(n_vert)]
+                self.verts_flat = stream.read_float_array(n_vert * 3)
                 n_tvert = stream.read32()
-                self.tverts = [stream.read_vec2() for i in range(n_tvert)]
-                self.normals = [stream.read_vec3() for i in range(n_vert)]
+                self.tverts_flat = stream.read_float_array(n_tvert * 2)
+                self.normals_flat = stream.read_float_array(n_vert * 3)
                 # TODO: don't read this when not relevant
                 self.enormals = [stream.read8() for i in range(n_vert)]
 
                 # Primitives and other stuff
                 self.primitives = [Primitive.read(stream) for i in range(stream.read32())]
-                self.indices = [stream.read16() for i in range(stream.read32())]
+                self.indices = stream.read_u16_array(stream.read32())
                 self.mindices = [stream.read16() for i in range(stream.read32())]
                 self.vertsPerFrame = stream.read32()
                 self.set_flags(stream.read32())
@@ -81,6 +81,13 @@ class ImportDTS(bpy.types.Operator, ImportHelper):
         default=False,
         )
 
+    debug_save_roundtrip = BoolProperty(
+        name="Write round-trip DTS",
+        description="Save the loaded shape back out to a .pass.dts file next to the original",
+        options=debug_prop_options,
+        default=False,
+        )
+
     def execute(self, context):
         from . import import_dts
 
@@ -6,7 +6,7 @@ from itertools import groupby
 from .DtsShape import DtsShape
 from .DtsTypes import *
 from .write_report import write_debug_report
-from .util import fail, resolve_texture, default_materials, evaluate_all, find_reference, \
+from .util import fail, build_texture_index, default_materials, evaluate_all, find_reference, \
     array_from_fcurves, array_from_fcurves_rotation, fcurves_keyframe_in_range
 from .shared_export import find_seqs
 
@@ -739,6 +739,9 @@ def write_material_textures(mode, filepath, shape, raw_colors):
     f_lookup = mode in ("custom-missing", "all-missing")
     f_custom = mode in ("custom-missing", "custom-always")
 
+    if f_lookup:
+        tex_index = build_texture_index(filepath)
+
     for material in shape.materials:
         if not hasattr(material, "bl_mat"):
             continue
@@ -746,7 +749,7 @@ def write_material_textures(mode, filepath, shape, raw_colors):
         if f_custom and material.name.lower() in default_materials:
             continue
 
-        if f_lookup and resolve_texture(filepath, material.name) is not None:
+        if f_lookup and material.name.lower() in tex_index:
             continue
 
         bl_mat = material.bl_mat
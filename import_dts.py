@@ -1,11 +1,11 @@
 import bpy
 import os
-from bpy_extras.io_utils import unpack_list
+import numpy as np
 
 from .DtsShape import DtsShape
 from .DtsTypes import *
 from .write_report import write_debug_report
-from .util import default_materials, resolve_texture, get_rgb_colors, fail, \
+from .util import default_materials, build_texture_index, prefetch_files, get_rgb_colors, fail, \
     ob_location_curves, ob_scale_curves, ob_rotation_curves, ob_rotation_data, evaluate_all
 
 import operator
@@ -29,18 +29,23 @@ def dedup_name(group, name):
         if new_name not in group:
             return new_name
 
-def import_material(color_source, dmat, filepath):
+def import_material(color_source, dmat, tex_index, loaded_images):
     bmat = bpy.data.materials.new(dedup_name(bpy.data.materials, dmat.name))
     bmat.diffuse_intensity = 1
 
-    texname = resolve_texture(filepath, dmat.name)
+    texname = tex_index.get(dmat.name.lower())
+    teximg = None
 
     if texname is not None:
-        try:
-            teximg = bpy.data.images.load(texname)
-        except:
-            print("Cannot load image", texname)
+        teximg = loaded_images.get(texname)
 
+        if teximg is None:
+            try:
+                teximg = loaded_images[texname] = bpy.data.images.load(texname)
+            except:
+                print("Cannot load image", texname)
+
+    if teximg is not None:
         texslot = bmat.texture_slots.add()
         texslot.use_map_alpha = True
         tex = texslot.texture = bpy.data.textures.new(dmat.name, "IMAGE")
@@ -89,78 +94,115 @@ def import_material(color_source, dmat, filepath):
 
     return bmat
 
-class index_pass:
-    def __getitem__(self, item):
-        return item
+def primitive_triangle_count(prim):
+    if prim.type & Primitive.TypeMask:
+        return max(prim.numElements - 2, 0)
+    else:
+        return prim.numElements // 3
 
-def create_bmesh(dmesh, materials, shape):
-    me = bpy.data.meshes.new("Mesh")
+def primitive_triangles(prim, indices, out):
+    first = prim.firstElement
+    last = prim.firstElement + prim.numElements
 
-    faces = []
-    material_indices = {}
+    if prim.type & Primitive.Indexed:
+        elements = indices[first:last]
+    else:
+        elements = np.arange(first, last, dtype=np.int32)
 
-    indices_pass = index_pass()
+    if prim.type & Primitive.TypeMask: # Strips and fans
+        out[:, 0] = elements[2:]
+        out[:, 1] = elements[1:-1]
 
-    for prim in dmesh.primitives:
-        if prim.type & Primitive.Indexed:
-            indices = dmesh.indices
+        if prim.type & Primitive.Strip:
+            out[:, 2] = elements[:-2]
         else:
-            indices = indices_pass
+            out[:, 2] = indices[0] if prim.type & Primitive.Indexed else 0
+
+        # Every other triangle has its winding flipped
+        out[1::2] = out[1::2, ::-1]
+    else: # Default to Triangle Lists (prim.type & Primitive.Triangles)
+        out[:, 0] = elements[2::3]
+        out[:, 1] = elements[1:-1:3]
+        out[:, 2] = elements[:-2:3]
+
+def create_bmesh(dmesh, materials, shape, validate=False):
+    me = bpy.data.meshes.new("Mesh")
+
+    mat_slot_of = [None] * len(shape.materials)
 
-        dmat = None
+    indices = np.asarray(dmesh.indices, dtype=np.int32)
+
+    prim_counts = [primitive_triangle_count(prim) for prim in dmesh.primitives]
+    tris = np.empty((sum(prim_counts), 3), dtype=np.int32)
+    mat_idx = np.empty(len(tris), dtype=np.int32)
+    written = 0
+
+    for prim, count in zip(dmesh.primitives, prim_counts):
+        mat_slot = 0
 
         if not (prim.type & Primitive.NoMaterial):
-            dmat = shape.materials[prim.type & Primitive.MaterialMask]
+            mat_key = prim.type & Primitive.MaterialMask
+            mat_slot = mat_slot_of[mat_key]
 
-            if dmat not in material_indices:
-                material_indices[dmat] = len(me.materials)
-                me.materials.append(materials[dmat])
+            if mat_slot is None:
+                mat_slot = mat_slot_of[mat_key] = len(me.materials)
+                me.materials.append(materials[shape.materials[mat_key]])
 
-        if prim.type & Primitive.Strip:
-            even = True
-            for i in range(prim.firstElement + 2, prim.firstElement + prim.numElements):
-                if even:
-                    faces.append(((indices[i], indices[i - 1], indices[i - 2]), dmat))
-                else:
-                    faces.append(((indices[i - 2], indices[i - 1], indices[i]), dmat))
-                even = not even
-        elif prim.type & Primitive.Fan:
-            even = True
-            for i in range(prim.firstElement + 2, prim.firstElement + prim.numElements):
-                if even:
-                    faces.append(((indices[i], indices[i - 1], indices[0]), dmat))
-                else:
-                    faces.append(((indices[0], indices[i - 1], indices[i]), dmat))
-                even = not even
-        else: # Default to Triangle Lists (prim.type & Primitive.Triangles)
-            for i in range(prim.firstElement + 2, prim.firstElement + prim.numElements, 3):
-                faces.append(((indices[i], indices[i - 1], indices[i - 2]), dmat))
-
-    me.vertices.add(len(dmesh.verts))
-    me.vertices.foreach_set("co", unpack_list(dmesh.verts))
-    me.vertices.foreach_set("normal", unpack_list(dmesh.normals))
-
-    me.polygons.add(len(faces))
-    me.loops.add(len(faces) * 3)
+        primitive_triangles(prim, indices, tris[written:written + count])
+        mat_idx[written:written + count] = mat_slot
+        written += count
+
+    verts = np.frombuffer(dmesh.verts_flat, dtype=np.float32)
+    num_verts = len(verts) // 3
+
+    # validate() is skipped outside of debugging, so drop the faces it would have
+    # removed here: ones that point past the vertex list, and the degenerate
+    # triangles that appear where strips are stitched together
+    in_range = (tris < num_verts).all(axis=1)
+    distinct = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+    keep = in_range & distinct
+
+    if not keep.all():
+        num_out_of_range = len(tris) - np.count_nonzero(in_range)
+
+        if num_out_of_range:
+            print("Warning: Dropping {} faces with out of range vertex indices".format(num_out_of_range))
+
+        tris = tris[keep]
+        mat_idx = mat_idx[keep]
+
+    # Group faces by material so each slot covers a contiguous run of polygons
+    order = np.argsort(mat_idx, kind="stable")
+    tris = tris[order]
+    mat_idx = mat_idx[order]
+
+    me.vertices.add(num_verts)
+    me.vertices.foreach_set("co", verts)
+    me.vertices.foreach_set("normal", np.frombuffer(dmesh.normals_flat, dtype=np.float32))
+
+    me.polygons.add(len(tris))
+    me.loops.add(len(tris) * 3)
+
+    me.loops.foreach_set("vertex_index", tris.ravel())
+    me.polygons.foreach_set("loop_start", np.arange(0, len(tris) * 3, 3, dtype=np.int32))
+    me.polygons.foreach_set("loop_total", np.full(len(tris), 3, dtype=np.int32))
+    me.polygons.foreach_set("material_index", mat_idx)
+    # DTS geometry is always smooth shaded
+    me.polygons.foreach_set("use_smooth", np.ones(len(tris), dtype=bool))
 
     me.uv_textures.new()
     uvs = me.uv_layers[0]
 
-    for i, ((verts, dmat), poly) in enumerate(zip(faces, me.polygons)):
-        poly.use_smooth = True # DTS geometry is always smooth shaded
-        poly.loop_total = 3
-        poly.loop_start = i * 3
+    loop_uvs = np.frombuffer(dmesh.tverts_flat, dtype=np.float32).reshape(-1, 2)[tris.ravel()]
+    loop_uvs[:, 1] = 1 - loop_uvs[:, 1]
+    uvs.data.foreach_set("uv", loop_uvs.ravel())
 
-        if dmat:
-            poly.material_index = material_indices[dmat]
+    # Only sanity check the generated topology when debugging; validate() would
+    # also build the edges, so ask update() to do that otherwise
+    if validate:
+        me.validate(verbose=False)
 
-        for j, index in zip(poly.loop_indices, verts):
-            me.loops[j].vertex_index = index
-            uv = dmesh.tverts[index]
-            uvs.data[j].uv = (uv.x, 1 - uv.y)
-
-    me.validate()
-    me.update()
+    me.update(calc_edges=True)
 
     return me
 
@@ -197,7 +239,8 @@ def load(operator, context, filepath,
          reference_keyframe=True,
          import_sequences=True,
          use_armature=False,
-         debug_report=False):
+         debug_report=False,
+         debug_save_roundtrip=False):
     shape = DtsShape()
 
     with open(filepath, "rb") as fd:
@@ -205,15 +248,23 @@ def load(operator, context, filepath,
 
     if debug_report:
         write_debug_report(filepath + ".txt", shape)
+
+    if debug_save_roundtrip:
         with open(filepath + ".pass.dts", "wb") as fd:
             shape.save(fd)
 
     # Create a Blender material for each DTS material
     materials = {}
+    loaded_images = {}
     color_source = get_rgb_colors()
+    tex_index = build_texture_index(filepath)
+
+    # Read the textures in parallel first so the serial image loads below hit the cache
+    prefetch_files({tex_index[dmat.name.lower()] for dmat in shape.materials
+        if dmat.name.lower() in tex_index})
 
     for dmat in shape.materials:
-        materials[dmat] = import_material(color_source, dmat, filepath)
+        materials[dmat] = import_material(color_source, dmat, tex_index, loaded_images)
 
     # Now assign IFL material properties where needed
     for ifl in shape.iflmaterials:
@@ -221,6 +272,8 @@ def load(operator, context, filepath,
         assert mat.torque_props.use_ifl == True
         mat.torque_props.ifl_name = shape.names[ifl.name]
 
+    node_names = [shape.names[node.name] for node in shape.nodes]
+
     # First load all the nodes into armatures
     lod_by_mesh = {}
 
@@ -255,7 +308,7 @@ def load(operator, context, filepath,
         bone_names = []
 
         for i, node in enumerate(shape.nodes):
-            bone = root_arm.edit_bones.new(shape.names[node.name])
+            bone = root_arm.edit_bones.new(node_names[i])
             # bone.use_connect = True
             # bone.head = node.head
             # bone.tail = node.tail
@@ -285,7 +338,10 @@ def load(operator, context, filepath,
 
         # Create an empty for every node
         for i, node in enumerate(shape.nodes):
-            ob = bpy.data.objects.new(dedup_name(bpy.data.objects, shape.names[node.name]), None)
+            location = shape.default_translations[i]
+            rotation = shape.default_rotations[i]
+
+            ob = bpy.data.objects.new(dedup_name(bpy.data.objects, node_names[i]), None)
             node.bl_ob = ob
             ob["nodeIndex"] = i
             ob.empty_draw_type = "SINGLE_ARROW"
@@ -294,16 +350,20 @@ def load(operator, context, filepath,
             if node.parent != -1:
                 ob.parent = node_obs[node.parent]
 
-            ob.location = shape.default_translations[i]
+            if node_names[i] == "__auto_root__" and rotation.magnitude == 0:
+                rotation = (1, 0, 0, 0)
+
+            ob.location = location
             ob.rotation_mode = "QUATERNION"
-            ob.rotation_quaternion = shape.default_rotations[i]
-            if shape.names[node.name] == "__auto_root__" and ob.rotation_quaternion.magnitude == 0:
-                ob.rotation_quaternion = (1, 0, 0, 0)
+            ob.rotation_quaternion = rotation
 
-            context.scene.objects.link(ob)
             node_obs.append(ob)
             node_obs_val[node] = ob
 
+        # Link them all at once rather than updating the scene as each one is created
+        for ob in node_obs:
+            context.scene.objects.link(ob)
+
         if reference_keyframe:
             insert_reference(reference_frame, shape.nodes)
 
@@ -425,10 +485,15 @@ def load(operator, context, filepath,
         sequences_buf.from_string("\n".join(sequences_text))
 
     # Then put objects in the armatures
+    lod_groups = {}
+    mesh_obs = []
+
     for obj in shape.objects:
+        obj_name = shape.names[obj.name]
+
         if obj.node == -1:
             print('Warning: Object {} is not attached to a node, ignoring'
-                  .format(shape.names[obj.name]))
+                  .format(obj_name))
             continue
 
         for meshIndex in range(obj.numMeshes):
@@ -440,12 +505,12 @@ def load(operator, context, filepath,
 
             if mtype != Mesh.StandardType and mtype != Mesh.SkinType:
                 print('Warning: Mesh #{} of object {} is of unsupported type {}, ignoring'.format(
-                    meshIndex + 1, mtype, shape.names[obj.name]))
+                    meshIndex + 1, mtype, obj_name))
                 continue
 
-            bmesh = create_bmesh(mesh, materials, shape)
-            bobj = bpy.data.objects.new(dedup_name(bpy.data.objects, shape.names[obj.name]), bmesh)
-            context.scene.objects.link(bobj)
+            bmesh = create_bmesh(mesh, materials, shape, validate=debug_report)
+            bobj = bpy.data.objects.new(dedup_name(bpy.data.objects, obj_name), bmesh)
+            mesh_obs.append(bobj)
 
             add_vertex_groups(mesh, bobj, shape)
 
@@ -461,12 +526,17 @@ def load(operator, context, filepath,
             else:
                 bobj.parent = node_obs[obj.node]
 
-            lod_name = shape.names[lod_by_mesh[meshIndex].name]
+            lod_group = lod_groups.get(meshIndex)
+
+            if lod_group is None:
+                lod_name = shape.names[lod_by_mesh[meshIndex].name]
+                lod_group = bpy.data.groups.get(lod_name) or bpy.data.groups.new(lod_name)
+                lod_groups[meshIndex] = lod_group
 
-            if lod_name not in bpy.data.groups:
-                bpy.data.groups.new(lod_name)
+            lod_group.objects.link(bobj)
 
-            bpy.data.groups[lod_name].objects.link(bobj)
+    for bobj in mesh_obs:
+        context.scene.objects.link(bobj)
 
     # Import a bounds mesh
     me = bpy.data.meshes.new("Mesh")
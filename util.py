@@ -3,10 +3,11 @@ import bpy
 from colorsys import hsv_to_rgb
 from itertools import count
 from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor
 
 texture_extensions = ("png", "jpg")
 
-default_materials = {
+_default_material_bytes = {
     "black": (0, 0, 0),
     "black25": (191, 191, 191),
     "black50": (128, 128, 128),
@@ -26,32 +27,71 @@ default_materials = {
     "yellow": (255, 255, 0)
 }
 
-for name, color in default_materials.items():
-    default_materials[name] = (color[0] / 255, color[1] / 255, color[2] / 255)
+default_materials = {name: (r / 255, g / 255, b / 255)
+    for name, (r, g, b) in _default_material_bytes.items()}
+default_materials.update({name.lower(): color
+    for name, color in default_materials.items()})
 
-for key, value in tuple(default_materials.items()):
-    default_materials[key.lower()] = value
+def scan_textures(dirname):
+    textures = {}
 
-def resolve_texture(filepath, name):
-    dirname = os.path.dirname(filepath)
+    try:
+        with os.scandir(dirname or os.curdir) as it:
+            for entry in it:
+                base, _, extension = entry.name.rpartition(".")
+                extension = extension.lower()
 
-    while True:
-        texbase = os.path.join(dirname, name)
+                if not base or extension not in texture_extensions or not entry.is_file():
+                    continue
 
-        for extension in texture_extensions:
-            texname = texbase + "." + extension
+                # Prefer extensions listed earlier in texture_extensions
+                key = base.lower()
+                other = textures.get(key)
 
-            if os.path.isfile(texname):
-                return texname
+                if other is None or texture_extensions.index(extension) < other[0]:
+                    textures[key] = (texture_extensions.index(extension), entry.path)
+    except OSError:
+        pass
 
-        if os.path.ismount(dirname):
-            break
+    return {key: path for key, (_, path) in textures.items()}
 
+def parent_dirs(filepath, max_depth=8):
+    parents = []
+    dirname = os.path.dirname(filepath)
+
+    # Pure string manipulation; the fixed point of dirname is the filesystem root
+    while len(parents) < max_depth:
+        parents.append(dirname)
         prevdir, dirname = dirname, os.path.dirname(dirname)
 
         if prevdir == dirname:
             break
 
+    return parents
+
+def build_texture_index(filepath, max_depth=8):
+    index = {}
+
+    # Walk outwards so that textures in nearer directories take precedence
+    for dirname in parent_dirs(filepath, max_depth):
+        for key, path in scan_textures(dirname).items():
+            index.setdefault(key, path)
+
+    return index
+
+def read_file_discard(filepath):
+    try:
+        with open(filepath, "rb") as fd:
+            while fd.read(1 << 20):
+                pass
+    except OSError:
+        pass
+
+def prefetch_files(filepaths, max_workers=8):
+    # Only warms the OS file cache; anything touching bpy must stay on the main thread
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor.map(read_file_discard, filepaths)
+
 def fractions():
     yield 0
 
@@ -143,10 +143,10 @@ def write_debug_report(filepath, shape):
                 mat = prim.type & Primitive.MaterialMask
                 flags += " MaterialMask:" + str(mat)
                 p("      " + str(prim.firstElement) + "->" + str(prim.firstElement + prim.numElements - 1) + " " + str(prim.type) + flags)
-            p("    + Vertices (" + str(len(mesh.verts)) + "): <omitted>")
+            p("    + Vertices (" + str(len(mesh.verts_flat) // 3) + "): <omitted>")
             # for i in range(len(mesh.verts)):
             #     p("      vert" + str(i) + " " + str(mesh.verts[i]) + " normal " + str(mesh.normals[i]) + " encoded " + str(mesh.enormals[i]))
-            p("    + Texture coords (" + str(len(mesh.tverts)) + "): <omitted>")
+            p("    + Texture coords (" + str(len(mesh.tverts_flat) // 2) + "): <omitted>")
             # for i in range(len(mesh.tverts)):
             #     p("      tvert" + str(i) + " " + str(mesh.tverts[i]))
 